@@ -0,0 +1,9 @@
+import json
+
+# orjson is optional, the standard library is used when it isn't installed
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
@@ -0,0 +1,32 @@
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def jit(signature=None, parallel=False):
+    """
+    Decorator compiling a function with `numba.njit(cache=True)`, or returning
+    it unchanged when numba is not installed.
+
+    Apply it to the innermost vectorizable function a wrangler calls, not to
+    `wrangle` itself; dispatching into a jitted function costs more than a
+    trivial method saves. Both `@jit` and `@jit(...)` are accepted.
+
+    :param signature: (Optional) A numba signature, e.g. 'float64[:](float64[:])',
+    so the function compiles when decorated rather than on its first call.
+    :param parallel: Passed to numba to enable automatic parallelization.
+    """
+    def decorator(func):
+        if numba is None:
+            return func
+        if signature is None:
+            return numba.njit(cache=True, parallel=parallel)(func)
+        return numba.njit(signature, cache=True, parallel=parallel)(func)
+
+    # Used bare as @jit, so the decorated function arrived in place of a signature
+    if callable(signature):
+        func, signature = signature, None
+        return decorator(func)
+
+    return decorator
@@ -1,13 +1,21 @@
 from enum import Enum
+import asyncio
+from collections import Counter
 import traceback
-from functools import wraps
 from types import MappingProxyType
-from typing import Mapping
+from typing import Any, Mapping, NamedTuple, Optional
 from pandas import json_normalize
-from concurrent.futures import ThreadPoolExecutor
-import textwrap
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import hashlib
 import json
+import os
+import pickle
+import queue
 import re
+import threading
+import time
+
+from ._json import loads as _json_loads
 
 
 """
@@ -32,6 +40,80 @@ class StatusError(Exception):
     def __str__(self):
         return self.message
 
+class ErrorInfo(dict):
+    """
+    Dictionary describing an error caught by an Operator, with keys type, message and trace.
+
+    The trace is only formatted the first time it is read, or the dict is
+    iterated, compared, copied or serialized, since walking and stringifying the stack
+    is wasted work for errors that are only counted. Once formatted, the
+    traceback's frames are cleared so their locals can be freed.
+    """
+    def __init__(self, exc):
+        super().__init__(type=exc.__class__.__name__, message=str(exc))
+        self.exc = exc
+
+    def _format_trace(self):
+        if not dict.__contains__(self, 'trace'):
+            exc = self.exc
+            dict.__setitem__(self, 'trace', ''.join(
+                traceback.format_exception(type(exc), exc, exc.__traceback__)))
+            traceback.clear_frames(exc.__traceback__)
+
+    def __missing__(self, key):
+        if key != 'trace':
+            raise KeyError(key)
+
+        self._format_trace()
+        return dict.__getitem__(self, 'trace')
+
+    def __contains__(self, key):
+        return key == 'trace' or super().__contains__(key)
+
+    def __iter__(self):
+        self._format_trace()
+        return super().__iter__()
+
+    def __len__(self):
+        self._format_trace()
+        return super().__len__()
+
+    def __repr__(self):
+        self._format_trace()
+        return super().__repr__()
+
+    def __eq__(self, other):
+        self._format_trace()
+        if isinstance(other, ErrorInfo):
+            other._format_trace()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def keys(self):
+        self._format_trace()
+        return super().keys()
+
+    def values(self):
+        self._format_trace()
+        return super().values()
+
+    def items(self):
+        self._format_trace()
+        return super().items()
+
+    def copy(self):
+        self._format_trace()
+        return dict(super().items())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
 class OpStatus(Enum):
     UNINITIALIZED = 'uninitialized'
     INITIALIZED = 'initialized'
@@ -60,6 +142,69 @@ class PipeStatus(Enum):
         return self.value
     
 
+# Matches in-string {{variables}} within task files. Names can't contain braces, so an
+# unclosed '{{' stops at the next brace instead of scanning the rest of the string.
+_DYN_PATTERN = re.compile(r'{{([^{}]*)}}')
+
+
+def _substitute(obj, pattern, repl):
+    """
+    Returns a copy of obj with `pattern` substituted by `repl` in every string key and value,
+    walking dicts and lists instead of round-tripping them through JSON. A string value that
+    is exactly one match is replaced by `repl`'s result as is, so it need not be a string.
+    Keys always stay strings.
+    """
+    if isinstance(obj, str):
+        match = pattern.match(obj)
+        if match is not None and match.end() == len(obj):
+            return repl(match)
+        return pattern.sub(lambda match: str(repl(match)), obj)
+    elif isinstance(obj, dict):
+        return {
+            (pattern.sub(lambda match: str(repl(match)), key) if isinstance(key, str) else key):
+                _substitute(val, pattern, repl)
+            for key, val in obj.items()}
+    elif isinstance(obj, list):
+        return [_substitute(val, pattern, repl) for val in obj]
+    else:
+        return obj
+
+
+def _find_vars(obj, pattern):
+    """
+    Returns the set of names `pattern` captures in the string keys and values of obj,
+    walking the same strings `_substitute` rewrites.
+    """
+    if isinstance(obj, str):
+        return set(pattern.findall(obj))
+    elif isinstance(obj, dict):
+        found = set()
+        for key, val in obj.items():
+            if isinstance(key, str):
+                found.update(pattern.findall(key))
+            found |= _find_vars(val, pattern)
+        return found
+    elif isinstance(obj, list):
+        found = set()
+        for val in obj:
+            found |= _find_vars(val, pattern)
+        return found
+    else:
+        return set()
+
+
+def _qualified_name(obj):
+    # Classes and functions by their own name, anything else by its class's
+    if not hasattr(obj, '__qualname__'):
+        obj = type(obj)
+    return f'{obj.__module__}.{obj.__qualname__}'
+
+
+def _cache_key_default(obj):
+    # Callables are named rather than repr'd, since a repr holding an address changes every process
+    return _qualified_name(obj) if callable(obj) else repr(obj)
+
+
 class OperatorUtils:
     """
     Class containing utility functions for pipeline Operators.
@@ -69,41 +214,47 @@ class OperatorUtils:
     Default is True.
 
     :attribute:
-    - catch_runtime_errors: A flag indicating whether to catch and handle runtime errors.
+    - catch_runtime_errors: A flag indicating whether to catch and handle runtime errors. Setting it rebinds run (via _bind_runs).
+    - run: Runs the Operator's _raw_run, returning a tuple of (response, error).
 
     :method:
-    - _catch_runtime_errors(func):
-    A staticmethod that acts as a decorator to catch and handle runtime errors
-    in pipeline Operators. The decorated function will return a tuple of (response, error),
-    where response is the function's output and error is None if no error occurs,
-    otherwise it is a dictionary containing the error information.
+    - _run_uncaught(*args, **kwargs): Calls _raw_run and returns (response, None), letting errors raise.
+    - _run_caught(*args, **kwargs): Calls _raw_run and returns (response, None), or (None, error)
+    where error is an ErrorInfo describing the raised exception.
     """
+    __slots__ = ('_catch_runtime_errors', 'run')
+
     def __init__(self, catch_runtime_errors=True):
         self.catch_runtime_errors = catch_runtime_errors
-    
-    @staticmethod
-    def _catch_runtime_errors(func):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            if not self.catch_runtime_errors:
-                return func(self, *args, **kwargs), None
-            else:
-                try:
-                    response = func(self, *args, **kwargs)
-                    return (response, None)
-                except Exception as e:
-                    error = dict(
-                        type=e.__class__.__name__,
-                        message=str(e),
-                        trace=traceback.format_exc()
-                    )
-                return (None, error)     
-        return wrapper
+
+    @property
+    def catch_runtime_errors(self):
+        return self._catch_runtime_errors
+
+    @catch_runtime_errors.setter
+    def catch_runtime_errors(self, catch_runtime_errors):
+        self._catch_runtime_errors = catch_runtime_errors
+        self._bind_runs(catch_runtime_errors)
+
+    def _bind_runs(self, catch_runtime_errors):
+        # Chosen when the flag is set, so run does not re-check it on every call
+        self.run = self._run_caught if catch_runtime_errors else self._run_uncaught
+
+    def _run_uncaught(self, *args, **kwargs):
+        return self._raw_run(*args, **kwargs), None
+
+    def _run_caught(self, *args, **kwargs):
+        try:
+            return self._raw_run(*args, **kwargs), None
+        except Exception as e:
+            return None, ErrorInfo(e)
 
 class Handle(OperatorUtils):
     """
     Class to extract data from a data source. It wraps around an arbitrary API client.
     :param api_client: A callable for handling data.
+    :param thread_safe_client: (Optional) False if one client must not be used from several threads at once.
+    Each thread then lazily builds its own client from the same credentials. Default is True.
     :param args: Other positional arguments.
     :param kwargs: Other keyword arguments.
 
@@ -111,42 +262,66 @@ class Handle(OperatorUtils):
     - initialize_error: None if no error occurred during initialization, otherwise contains the error information.
     - _status: The status of the Handle. Default is `OpStatus.UNINITIALIZED`.
     - api_client: The callable for handling data.
+    - thread_safe_client: Whether the initialized client is shared by every thread.
 
     :method:
-    - initialize(credentials): Initializes the user supplied api_client.
+    - initialize(credentials, client_cache=None): Initializes the user supplied api_client.
     - status: A property that returns the current status of the Handle.
-    - run(request, handle_operations={}): Handles the data using the provided `api_client` callable, with the provided `handle_operations`.
+    - run(request, handle_operations=()): Handles the data using the provided `api_client` callable, with the provided `handle_operations`.
+    - supports_batch: A property, True if the initialized client has a `get_data_batch(requests)` method.
+    - run_batch(requests): Sends every request through one `get_data_batch` call, returning (responses, error).
     """
 
-    def __init__(self, api_handle, **kwargs):
+    __slots__ = ('_status', 'client', 'initialize_error', 'thread_safe_client', '_client_factory', '_credentials',
+                 '_local', 'run_batch')
+
+    def __init__(self, api_handle, thread_safe_client=True, **kwargs):
         """
         Initialize the Handle class.
 
         :param api_client: A callable for requesting data.
+        :param thread_safe_client: False to give each thread its own client.
         :param kwargs: Flags passed to OperatorUtils
         """
         super().__init__(**kwargs)
         self._status = OpStatus.UNINITIALIZED
         self.client = api_handle
         self.initialize_error = None
+        self.thread_safe_client = thread_safe_client
+        self._client_factory = api_handle
+        self._credentials = None
+        self._local = threading.local()
     
-    def initialize(self, credentials):
+    def initialize(self, credentials, client_cache=None):
         """
         Initialize the api_client object.
-        
+
+        :param credentials: The credentials passed to api_client.
+        :param client_cache: (Optional) A dict, owned by the caller, mapping api_client to a
+        (credentials, client) pair. A thread-safe client in it is reused when it was built
+        from these same credentials (by identity), otherwise a new one is built and stored.
         :return: OpStatus (INITIALIZED or FAIL)
         :raises: Exception if error occurs during initialization
         """
         try:
-            self.client = self.client(credentials)
+            if self.thread_safe_client:
+                cached = client_cache.get(self._client_factory) if client_cache is not None else None
+                if cached is not None and cached[0] is credentials:
+                    client = cached[1]
+                else:
+                    client = self._client_factory(credentials)
+                    if client_cache is not None:
+                        client_cache[self._client_factory] = (credentials, client)
+            else:
+                # Built here for the initializing thread, so bad credentials still fail now
+                self._local = threading.local()
+                client = self._local.client = self._client_factory(credentials)
+            self._credentials = credentials
+            self.client = client
             self._status = OpStatus.INITIALIZED
         except Exception as e:
             self._status = OpStatus.FAIL
-            self.initialize_error = dict(
-                type=e.__class__.__name__,
-                message=str(e),
-                trace=traceback.format_exc()
-            )
+            self.initialize_error = ErrorInfo(e)
             raise e from None
             
         return self._status
@@ -155,10 +330,49 @@ class Handle(OperatorUtils):
     def status(self) -> OpStatus:
         return self._status
     
-    @OperatorUtils._catch_runtime_errors
-    def run(self, request, handle_operations=[]):
-        if self._status == OpStatus.INITIALIZED:
-            response = self.client.get_data(request, *handle_operations)
+    @property
+    def supports_batch(self) -> bool:
+        # Batching hands one client every request, so it is limited to clients that are shared anyway
+        return (self._status is OpStatus.INITIALIZED and self.thread_safe_client
+                and callable(getattr(self.client, 'get_data_batch', None)))
+
+    def _bind_runs(self, catch_runtime_errors):
+        super()._bind_runs(catch_runtime_errors)
+        self.run_batch = self._run_batch_caught if catch_runtime_errors else self._run_batch_uncaught
+
+    def _run_batch_uncaught(self, requests):
+        return self._raw_run_batch(requests), None
+
+    def _run_batch_caught(self, requests):
+        try:
+            return self._raw_run_batch(requests), None
+        except Exception as e:
+            return None, ErrorInfo(e)
+
+    def _raw_run_batch(self, requests):
+        if self._status is not OpStatus.INITIALIZED:
+            raise StatusError(
+                f'Can not run while Handle is {self._status}')
+
+        responses = self.client.get_data_batch(requests)
+        if len(responses) != len(requests):
+            raise ValueError(f'get_data_batch returned {len(responses)} responses for {len(requests)} requests')
+        return responses
+
+    def _thread_client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self._client_factory(self._credentials)
+        return client
+
+    def _raw_run(self, request, handle_operations=()):
+        if self._status is OpStatus.INITIALIZED:
+            client = self.client if self.thread_safe_client else self._thread_client()
+            # Most tasks have no operations, so skip building the argument tuple for them
+            if handle_operations:
+                response = client.get_data(request, *handle_operations)
+            else:
+                response = client.get_data(request)
         else:
             raise StatusError(
                 f'Can not run while Handle is {self._status}')
@@ -182,8 +396,10 @@ class Wrangler(OperatorUtils):
     :method:
     - initialize(): Initializes the user supplied wrangler.
     - status: A property that returns the current status of the Wrangler.
-    - run(data, wrangle_operations=[]): Wrangles the data using the provided `wrangler` callable, with the provided `wrangle_operations`.
+    - run(data, wrangle_operations=()): Wrangles the data using the provided `wrangler` callable, with the provided `wrangle_operations`.
     """
+    __slots__ = ('_status', 'wrangler', 'initialize_error', '_wrangler_factory')
+
     def __init__(self, wrangler, **kwargs):
         """
         Initialize the Wrangler class.
@@ -195,6 +411,8 @@ class Wrangler(OperatorUtils):
         self._status = OpStatus.UNINITIALIZED
         self.wrangler = wrangler
         self.initialize_error = None
+        # Kept apart from the built wrangler, so initialize can run again
+        self._wrangler_factory = wrangler
     
     def initialize(self):
         """
@@ -204,15 +422,11 @@ class Wrangler(OperatorUtils):
         :raises: Exception if error occurs during initialization
         """
         try:
-            self.wrangler = self.wrangler()
+            self.wrangler = self._wrangler_factory()
             self._status = OpStatus.INITIALIZED
         except Exception as e:
             self._status = OpStatus.FAIL
-            self.initialize_error = dict(
-                type=e.__class__.__name__,
-                message=str(e),
-                trace=traceback.format_exc()
-            )
+            self.initialize_error = ErrorInfo(e)
             raise e from None
             
         return self._status
@@ -221,10 +435,12 @@ class Wrangler(OperatorUtils):
     def status(self) -> OpStatus:
         return self._status
     
-    @OperatorUtils._catch_runtime_errors
-    def run(self, data, wrangle_operations=[]):
-        if self._status == OpStatus.INITIALIZED:
-            response = self.wrangler.wrangle(data, *wrangle_operations)
+    def _raw_run(self, data, wrangle_operations=()):
+        if self._status is OpStatus.INITIALIZED:
+            if wrangle_operations:
+                response = self.wrangler.wrangle(data, *wrangle_operations)
+            else:
+                response = self.wrangler.wrangle(data)
         else:
             raise StatusError(
                 f'Can not run while Wrangler is {self._status}')
@@ -248,8 +464,10 @@ class Loader(OperatorUtils):
     :method:
     - initialize(): Initializes the user supplied loader.
     - status: A property that returns the current status of the Loader.
-    - run(data, load_operations={}): Loads the data using the provided `loader` callable, with the provided `load_operations`.
+    - run(data, load_operations=()): Loads the data using the provided `loader` callable, with the provided `load_operations`.
     """
+    __slots__ = ('_status', 'loader', 'initialize_error', '_loader_factory')
+
     def __init__(self, loader, **kwargs):
         """
         Initialize the Loader class.
@@ -261,6 +479,8 @@ class Loader(OperatorUtils):
         self._status = OpStatus.UNINITIALIZED
         self.loader = loader
         self.initialize_error = None
+        # Kept apart from the built loader, so initialize can run again
+        self._loader_factory = loader
     
     def initialize(self):
         """
@@ -271,15 +491,11 @@ class Loader(OperatorUtils):
         """
         
         try:
-            self.loader = self.loader()
+            self.loader = self._loader_factory()
             self._status = OpStatus.INITIALIZED
         except Exception as e:
             self._status = OpStatus.FAIL
-            self.initialize_error = dict(
-                type=e.__class__.__name__,
-                message=str(e),
-                trace=traceback.format_exc()
-            )
+            self.initialize_error = ErrorInfo(e)
             raise e from None
             
         return self._status
@@ -288,10 +504,12 @@ class Loader(OperatorUtils):
     def status(self) -> OpStatus:
         return self._status
     
-    @OperatorUtils._catch_runtime_errors
-    def run(self, data, load_operations=[]):
-        if self._status == OpStatus.INITIALIZED:
-            response = self.loader.load(data, *load_operations)
+    def _raw_run(self, data, load_operations=()):
+        if self._status is OpStatus.INITIALIZED:
+            if load_operations:
+                response = self.loader.load(data, *load_operations)
+            else:
+                response = self.loader.load(data)
         else:
             raise StatusError(
                 f'Can not run while Loader is {self._status}')
@@ -319,6 +537,11 @@ class TaskOpsUtils:
     - _run_operation(op, runner, passable, skip_status_update=False): Run an operation.
     - update_status(): Update the overall status of the task.
     """
+    __slots__ = (
+        'handle', 'wrangler', 'loader', 'handle_result', 'wrangle_result', 'load_result',
+        'error', 'op_statuses', 'special_operations'
+    )
+
     def __init__(self, handle, wrangler, loader, handle_ops, wrangle_ops, load_ops):
         self.handle = handle
         self.wrangler = wrangler
@@ -341,10 +564,11 @@ class TaskOpsUtils:
             load_ops = load_ops
         )
     
-    def _run_operation(self, op, runner, passable, spec_ops=[], skip_status_update=False):
-        self.op_statuses[op] = TaskStatus.INCOMPLETE
-        response, self.error = runner.run(passable, spec_ops)
-        status = self.op_statuses[op] = TaskStatus.FAIL if self.error is not None else TaskStatus.COMPLETE           
+    def _run_operation(self, op, runner, passable, spec_ops=(), skip_status_update=False):
+        response, error = runner.run(passable, spec_ops)
+        self.error = error
+        status = TaskStatus.FAIL if error is not None else TaskStatus.COMPLETE
+        self.op_statuses[op] = status
 
         if not skip_status_update:
             self.update_status()
@@ -352,6 +576,21 @@ class TaskOpsUtils:
         return status, response
 
     
+class TaskInfo(NamedTuple):
+    """
+    Read-only information about a Task. Keyword arguments the Task
+    was created with, beyond the named fields, are kept in `extras`.
+    """
+    name: str
+    description: Optional[str]
+    type: str
+    req: Any
+    handle: Any
+    wrangler: Any
+    loader: Any
+    extras: Mapping
+
+
 class Task(TaskOpsUtils):
     """
     A base class for managing a task.
@@ -369,12 +608,27 @@ class Task(TaskOpsUtils):
     - name: The name of the task.
     - description: The description of the task.
     - data: The response data from task operators.
-    - info: A mapping proxy type containing information about the task.
+    - info: A TaskInfo named tuple containing information about the task.
+    - deps: Names of tasks in the same pipe that must complete before this one runs (kwarg `deps`).
+    - pipe_type: 'PARALLEL' (default), or 'SERIAL' if the task must never run alongside another serial task of its pipe (kwarg `pipe_type`).
+      Enforced by every Pipe run method and by Pipeline.run_scheduled; calling Task.run directly bypasses it.
+    - cache: Whether a completed run's data is saved to, and later reused from, cache_dir (kwarg `cache`). Default is False.
+      Only `run` reads and writes the cache; run_step, run_from_response and the Pipe's staged and batched
+      runs always call the operators. A cache hit marks every operation COMPLETE without calling any of
+      them, so a loader with side effects does not run again.
+    - cache_dir: Directory cached runs are kept in. Set by the owning Pipe.
+    - cache_scope: The owning Pipe's (name, secret_id), part of the cache key so pipes with other accounts never share data. Set by the owning Pipe.
 
     :method:
-    - run(): Run the task.
+    - run(resume=False): Run the task. With `resume`, operations that already completed are not run again.
+    - run_async(): Coroutine running the task in a worker thread.
+    - run_step(index): Runs the operation at `index` (handle, wrangle, load) if the one before it completed.
+    - release(op): Drops the data of operation `op` and sets it back to PENDING.
     - update_status(): Updates the status of the task.
     """
+    __slots__ = ('_status', 'name', 'description', 'info', 'data', 'deps', 'pipe_type', 'cache', 'cache_dir',
+                 'cache_scope', '_op_plan', '_on_status_change')
+
     def __init__(self, name, req_dict, handle, wrangler=None, loader=None, description=None, **kwargs):
         """
         Initialize the Task class.
@@ -391,24 +645,39 @@ class Task(TaskOpsUtils):
             handle=handle, 
             wrangler=wrangler, 
             loader=loader, 
-            handle_ops=kwargs.get('handle_ops', []), 
-            wrangle_ops=kwargs.get('wrangle_ops', []), 
-            load_ops=kwargs.get('load_ops', [])
+            handle_ops=kwargs.get('handle_ops', ()), 
+            wrangle_ops=kwargs.get('wrangle_ops', ()), 
+            load_ops=kwargs.get('load_ops', ())
         )
 
         self._status = TaskStatus.PENDING
+        # Called with (old, new) whenever update_status changes the status; set by the owning Pipe
+        self._on_status_change = None
         self.name = name
         self.description = description
-        self.info = MappingProxyType({
-            'name': name,
-            'description': description,
-            'type': self.__class__.__name__,
-            'req': req_dict,
-            'handle': handle,
-            'wrangler': wrangler,
-            'loader': loader,
-            **kwargs
-        })
+        self.deps = tuple(kwargs.get('deps', ()))
+        self.pipe_type = kwargs.get('pipe_type', 'PARALLEL')
+        if self.pipe_type not in ('SERIAL', 'PARALLEL'):
+            raise ValueError(f"pipe_type must be 'SERIAL' or 'PARALLEL', not {self.pipe_type!r}")
+        self.cache = kwargs.get('cache', False)
+        self.cache_dir = None
+        self.cache_scope = None
+        # Built once, so run steps through bound methods instead of dispatching on op names
+        self._op_plan = [('handle', self.run_request, self.special_operations['handle_ops'])]
+        if wrangler:
+            self._op_plan.append(('wrangle', self.run_wrangle, self.special_operations['wrangle_ops']))
+        if loader:
+            self._op_plan.append(('load', self.run_load, self.special_operations['load_ops']))
+        self.info = TaskInfo(
+            name=name,
+            description=description,
+            type=self.__class__.__name__,
+            req=req_dict,
+            handle=handle,
+            wrangler=wrangler,
+            loader=loader,
+            extras=MappingProxyType(kwargs)
+        )
 
     def __repr__(self):
         return f"Task('{self.name}', status='{self.status}'),"
@@ -417,30 +686,88 @@ class Task(TaskOpsUtils):
     def status(self) -> TaskStatus:
         return self._status.value
     
-    def run(self):
+    def run_step(self, index):
+        op, runner, spec_ops = self._op_plan[index]
+        # Each operation only runs once the one before it has completed
+        if index and self.op_statuses[self._op_plan[index - 1][0]] is not TaskStatus.COMPLETE:
+            # Skipped for the current data, so it must not keep a status from an earlier run
+            self.op_statuses[op] = TaskStatus.PENDING
+            return None
+
+        return runner(spec_ops=spec_ops, skip_status_update=True)
+
+    def release(self, op):
+        # A released operation is PENDING again, so run(resume=True) redoes it rather than trusting missing data
+        self.data[op] = None
+        if op in self.op_statuses:
+            self.op_statuses[op] = TaskStatus.PENDING
+
+    def _cache_path(self):
+        # Same pipe and secret, task type, name, request(s), operators and operator args means the same result.
+        # The operators are keyed by the user supplied callables, not their per-pipe wrappers.
+        operators = [_qualified_name(operator) if operator is not None else None for operator in (
+            getattr(self.handle, '_client_factory', self.handle),
+            getattr(self.wrangler, '_wrangler_factory', self.wrangler),
+            getattr(self.loader, '_loader_factory', self.loader))]
+        key = json.dumps([self.cache_scope, self.info.type, self.name, self.info.req, operators,
+                          self.special_operations], sort_keys=True, default=_cache_key_default)
+        return os.path.join(self.cache_dir, hashlib.blake2b(key.encode()).hexdigest() + '.pkl')
+
+    def run(self, resume=False):
+        cache_path = self._cache_path() if self.cache and self.cache_dir else None
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path, 'rb') as cached:
+                self.data = pickle.load(cached)
+            for op, runner, spec_ops in self._op_plan:
+                self.op_statuses[op] = TaskStatus.COMPLETE
+            self.update_status()
+            return self._completed_statuses()
+
         statuses = {}
-        for op in self.op_statuses:
-            status = None
-            if op == 'handle':
-                spec_ops = self.special_operations.get('handle_ops')
-                status = self.run_request(spec_ops=spec_ops, skip_status_update=True)
-            elif op == 'wrangle' and self.op_statuses['handle'] == TaskStatus.COMPLETE:
-                spec_ops = self.special_operations.get('wrangle_ops')
-                status = self.run_wrangle(spec_ops=spec_ops, skip_status_update=True)
-            elif op == 'load' and self.op_statuses['wrangle'] == TaskStatus.COMPLETE:
-                spec_ops = self.special_operations.get('load_ops')
-                status = self.run_load(spec_ops=spec_ops, skip_status_update=True)
-
-            statuses[op] = status
+        for index, (op, runner, spec_ops) in enumerate(self._op_plan):
+            # A completed step's output is still in self.data, so resuming starts at the first step that didn't
+            # complete
+            if resume and self.op_statuses[op] is TaskStatus.COMPLETE:
+                statuses[op] = TaskStatus.COMPLETE
+                continue
+            statuses[op] = self.run_step(index)
 
         self.update_status()
+        if cache_path is not None and self._status is TaskStatus.COMPLETE:
+            # Written aside and moved into place, so a concurrent reader never sees a partial file
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f'{cache_path}.{threading.get_ident()}.tmp'
+            try:
+                with open(tmp_path, 'wb') as cached:
+                    pickle.dump(self.data, cached)
+                os.replace(tmp_path, cache_path)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # Data that can't be pickled just isn't cached
+                pass
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
         return statuses
 
+    def _completed_statuses(self):
+        # What run returns when every operation completed, for a cache hit
+        return {op: TaskStatus.COMPLETE for op, runner, spec_ops in self._op_plan}
+
+    async def run_async(self):
+        # The operators block on I/O, so run them off the event loop
+        return await asyncio.to_thread(self.run)
+
     def update_status(self):
-        if len(set(self.op_statuses.values())) == 1:
-            self._status = set(self.op_statuses.values()).pop()
-        else:
-            self._status = TaskStatus.INCOMPLETE
+        # A task has at most three operations, so compare them directly rather than building a set
+        handle = self.op_statuses['handle']
+        wrangle = self.op_statuses.get('wrangle', handle)
+        load = self.op_statuses.get('load', handle)
+        status = handle if handle is wrangle is load else TaskStatus.INCOMPLETE
+
+        previous, self._status = self._status, status
+        if status is not previous and self._on_status_change is not None:
+            self._on_status_change(previous, status)
 
 class SingleRequestTask(Task):
     """
@@ -460,7 +787,10 @@ class SingleRequestTask(Task):
     - run_request(): Runs the request for the task.
     - run_wrangle(): Runs the wrangler for the task.
     - run_load(): Runs the loader for the task.
+    - run_from_response(response, error=None): Runs the rest of the task from a handle response fetched elsewhere.
     """
+    __slots__ = ('request',)
+
     def __init__(self, name, request, handle, wrangler=None, loader=None, **kwargs):
         super().__init__(name, request, handle, wrangler, loader, **kwargs)
         self.request = request
@@ -475,6 +805,18 @@ class SingleRequestTask(Task):
         self.data['handle'] = response
         return status
 
+    def run_from_response(self, response, error=None):
+        self.error = error
+        self.op_statuses['handle'] = TaskStatus.FAIL if error is not None else TaskStatus.COMPLETE
+        self.data['handle'] = response
+
+        statuses = {'handle': self.op_statuses['handle']}
+        for index in range(1, len(self._op_plan)):
+            statuses[self._op_plan[index][0]] = self.run_step(index)
+
+        self.update_status()
+        return statuses
+
     def run_wrangle(self, spec_ops, skip_status_update=False):
         status, response = self._run_operation('wrangle', self.wrangler, self, spec_ops, skip_status_update)
         self.data['wrangle'] = response
@@ -486,6 +828,23 @@ class SingleRequestTask(Task):
         return status
 
     
+class _LazyResponse:
+    """
+    Wraps a raw handle response and only normalizes it into a DataFrame
+    once a column is actually requested.
+    """
+    __slots__ = ('raw', '_df')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._df = None
+
+    def __getitem__(self, column):
+        if self._df is None:
+            self._df = json_normalize(self.raw)
+        return self._df[column]
+
+
 class MultiRequestTask(Task):
     """
     A class for managing multiple requests. Inherits from the base Task class.
@@ -499,53 +858,80 @@ class MultiRequestTask(Task):
 
     :attribute:
     - requests: The requests for the task.
+    - template_vars: The <<variables>> referenced by each request.
 
     :method:
     - run_request(): Runs the requests for the task.
+    - release(op): Drops the data of operation `op`, keeping the per-request handle list, and sets it back to PENDING.
     """
+    __slots__ = ('requests', 'cached_unique_values', 'cached_joined_values', 'template_vars')
+
+    # Matches in-string <<variables>> filled from the previous response
+    _VAR_PATTERN = re.compile(r'<<(.*?)>>')
+
     def __init__(self, name, requests, handle, wrangler=None, loader=None, **kwargs):      
         super().__init__(name, requests, handle, wrangler, loader, **kwargs)
         self.requests: dict = requests
-        self.pattern = re.compile(r'<<(.*?)>>')
         self.cached_unique_values = {}
+        self.cached_joined_values = {}
+        # Found once per request, so requests without <<variables>> can skip substitution
+        self.template_vars = {
+            _iter: _find_vars(request, self._VAR_PATTERN)
+            for _iter, request in requests.items()
+        }
         self.data = dict(
-            handle=[],
+            handle=[None] * len(requests),
             wrangle=None,
             load=None
         )
         
     def run_request(self, spec_ops, skip_status_update=False):
         statuses = dict()
-        pattern = self.pattern
+        pattern = self._VAR_PATTERN
         
-        # Use the stored unique values if possible
+        # Unique values are stored before substituting, so only their joined strings are built here
         def hook(match, separator):
             in_string_var = match.group(1)
-            if in_string_var in self.cached_unique_values:
+            joined = self.cached_joined_values.get((in_string_var, separator))
+            if joined is None:
                 unique_values = self.cached_unique_values[in_string_var]
-            else:
-                unique_values = last_response[in_string_var].unique().tolist()
-                self.cached_unique_values[in_string_var] = unique_values
-            
-            return separator.join(map(str, unique_values))
+                joined = self.cached_joined_values[(in_string_var, separator)] = separator.join(map(str, unique_values))
+            return joined
         
         last_response = None
-        for _iter, request in self.requests.items():
-            if last_response is not None:
+        for index, (_iter, request) in enumerate(self.requests.items()):
+            template_vars = self.template_vars[_iter]
+            if last_response is not None and template_vars:
+                # Use the stored unique values if possible, fetching every missing one up front
+                for in_string_var in template_vars - self.cached_unique_values.keys():
+                    self.cached_unique_values[in_string_var] = last_response[in_string_var].unique().tolist()
+
                 separator = request.get("%separator%", ", ")
-                request = json.loads(pattern.sub(lambda x: hook(x, separator), json.dumps(request)))
+                request = _substitute(request, pattern, lambda x: hook(x, separator))
             
             status, response = self._run_operation('handle', self.handle, request, spec_ops, skip_status_update)
-            self.data['handle'].append(response)
+            self.data['handle'][index] = response
             
-            statuses.update({_iter:status})
+            statuses[_iter] = status
             if status is not TaskStatus.COMPLETE:
                 break
             else:
-                last_response = json_normalize(response)
+                last_response = _LazyResponse(response)
         
         return statuses
                                   
+    def _completed_statuses(self):
+        # run_request reports a status per request
+        statuses = super()._completed_statuses()
+        statuses['handle'] = dict.fromkeys(self.requests, TaskStatus.COMPLETE)
+        return statuses
+
+    def release(self, op):
+        super().release(op)
+        if op == 'handle':
+            # run_request fills the responses in place, so they go back to a preallocated list
+            self.data['handle'] = [None] * len(self.requests)
+
     def run_wrangle(self, spec_ops, skip_status_update=False):
         status, response = self._run_operation('wrangle', self.wrangler, self, spec_ops, skip_status_update)
         self.data['wrangle'] = response
@@ -555,6 +941,13 @@ class MultiRequestTask(Task):
         status, response = self._run_operation('load', self.loader, self, spec_ops, skip_status_update)
         self.data['load'] = response
         return status
+
+
+# Task class built for each request key a task dict may carry, checked in order
+_TASK_TYPES = (
+    ('request', SingleRequestTask),
+    ('requests', MultiRequestTask),
+)
         
         
 class TaskManagementUtils:
@@ -576,23 +969,50 @@ class TaskManagementUtils:
     - get_task_statuses(self): Gets the statuses of all tasks.
     - get_task_status_counts(self): Gets the count of tasks in each status.
     - run_task(self, task_name): Runs a task by the given name, raises ValueError if task not found.
+    - run_all(self, max_workers=None): Runs every task concurrently in a thread pool, returns statuses by task name.
     - get_task_data(self, task_name, operator=None): Gets the data of a task by the given name, returns all data if operator is None.
     - get_all_tasks_data(self, operator=None): Gets the data of all tasks, returns all data for each task if operator is None.
+    - iter_tasks_data(self, operator=None, release=False): Yields (task_name, data) one task at a time, clearing each task's data, and setting its operations back to PENDING, once the next is requested if release.
     - get_task(self, task_name): Gets a task by the given name, raises ValueError if task not found.
     """
+    __slots__ = ('operator_statuses', 'task_map', '_status_counts', '_status_lock', '_task_version')
+
     def __init__(self):
         self.operator_statuses = dict(
             handle = None,
             wrangler = None,
             loader = None
         )
+        # Kept up to date by the tasks themselves, so counting never rescans task_map
+        self._status_counts = Counter({status.value: 0 for status in TaskStatus})
+        self._status_lock = threading.Lock()
+        # Bumped whenever a task is added, removed, or changes status
+        self._task_version = 0
+
+    def _track_task(self, task):
+        task._on_status_change = self._on_task_status_change
+        with self._status_lock:
+            self._status_counts[task._status.value] += 1
+            self._task_version += 1
+
+    def _untrack_task(self, task):
+        task._on_status_change = None
+        with self._status_lock:
+            self._status_counts[task._status.value] -= 1
+            self._task_version += 1
+
+    def _on_task_status_change(self, old, new):
+        # Tasks may finish on several threads at once
+        with self._status_lock:
+            self._status_counts[old.value] -= 1
+            self._status_counts[new.value] += 1
+            self._task_version += 1
 
     # Handles dynamic reading of in-string variables
     @staticmethod
     def dynamically_read(raw_tasks, task_kwargs=dict()):
-        regex_pattern = re.compile(r'{{(.*?)}}')
-        
-        # Hook to replace in-string {{variables}} with kwarg values
+        # Hook to replace in-string {{variables}} with kwarg values. A value that is only
+        # "{{variable}}" takes the kwarg itself, so numbers, lists and dicts keep their type.
         def regex_hook(match):            
             if not match.group(1) in task_kwargs:
                 raise ValueError(
@@ -600,32 +1020,23 @@ class TaskManagementUtils:
                     f'but no value was specified for this key.')
             else:
                 return task_kwargs[match.group(1)]
-            
-        # Hook to catch in-string {{variables}}
-        def json_hook(_dict):
-            for key, val in _dict.items():
-                _dict[key] = json.loads(
-                    regex_pattern.sub(regex_hook, json.dumps(val)))
-
-            return _dict
 
         # Returns the filled tasks
         with raw_tasks:
-            return json.loads(
-                raw_tasks.read(),
-                object_hook=json_hook
-            )
+            return _substitute(_json_loads(raw_tasks.read()), _DYN_PATTERN, regex_hook)
         
     @staticmethod
     def read_tasks(tasks_file_path=None, task_kwargs=None, dynamic_reader=None):
+        # Parsed fresh for every pipe: building tasks mutates the dicts, and a reparse is
+        # cheaper than deep-copying a cached parse
         with open(tasks_file_path) as raw_tasks:
             if task_kwargs:
                 tasks = dynamic_reader(raw_tasks, task_kwargs)
             else:
-                tasks = json.load(raw_tasks)
-        task_names = set(task['name'] for task in tasks)
-        if len(task_names) != len(tasks):
-            duplicates = task_names - set(task['name'] for task in tasks)
+                tasks = _json_loads(raw_tasks.read())
+        name_counts = Counter(task['name'] for task in tasks)
+        duplicates = [name for name, count in name_counts.items() if count > 1]
+        if duplicates:
             raise ValueError(f"Duplicate tasks with names: {duplicates}")
 
         return tasks
@@ -633,57 +1044,58 @@ class TaskManagementUtils:
     @staticmethod
     def task_obj_from_dict(task, handle, wrangler=None, loader=None):
         name = task.pop('name')
-        if task.get('request'):
-            request = task.pop('request')
-            task_obj = SingleRequestTask(name, request, handle, wrangler, loader, **task)
-        elif task.get('requests'):
-            requests = task.pop('requests')
-            task_obj = MultiRequestTask(name, requests, handle, wrangler, loader, **task)
-        else:
-            raise ValueError("Either 'request' or 'requests' must be supplied.")
+        for key, task_cls in _TASK_TYPES:
+            if task.get(key):
+                return task_cls(name, task.pop(key), handle, wrangler, loader, **task)
 
-        return task_obj
+        raise ValueError("Either 'request' or 'requests' must be supplied.")
 
     def add_task(self, task_name, task_obj=None, task_dict=None):
         if task_dict:
-            task_obj = task_obj_from_dict(task_dict, self.handle, self.wrangler, self.loader)
-            
-        self.task_map.update({task_name:task_obj})
+            task_obj = self.task_obj_from_dict(task_dict, self.handle, self.wrangler, self.loader)
+
+        replaced_task = self.task_map.get(task_name)
+        if replaced_task is not None:
+            self._untrack_task(replaced_task)
+        self._track_task(task_obj)
+        self.task_map[task_name] = task_obj
             
     def get_task_status(self, task_name):
-        task = self.tasks.get(task_name)
+        task = self.task_map.get(task_name)
         if task is None:
             raise ValueError(f"Task {task_name} not found")
             
         return task.status
     
     def get_task_statuses(self):
-        statuses = dict()
-        for task_name, task in self.task_map.items():
-            statuses.update({task_name:task.status})
-            
-        return statuses
+        return {task_name: task.status for task_name, task in self.task_map.items()}
     
     def get_task_status_counts(self):
-        statuses = dict(
-            pending = 0,
-            incomplete = 0,
-            complete = 0,
-            fail = 0,
-        )
-        
-        for task_name, task in self.task_map.items():
-            statuses[task.status] += 1
-            
-        return statuses
+        with self._status_lock:
+            return self._status_counts.copy()
         
     def run_task(self, task_name):
         task = self.task_map.get(task_name)
         if task is None:
             raise ValueError(f"Task {task_name} not found")
         
-        status = task.run()
+        status = self._run_task(task)
         return status
+
+    def _run_task(self, task, resume=False):
+        return task.run(resume)
+
+    def run_all(self, max_workers=None):
+        # Tasks are independent of one another, so their (mostly network-bound) operations
+        # can overlap. Requests within a MultiRequestTask still run sequentially inside task.run.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._run_task, task): task_name for task_name, task in self.task_map.items()}
+
+            results = {}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
     
     def get_task_data(self, task_name, operator=None):
         task = self.task_map.get(task_name)
@@ -698,16 +1110,19 @@ class TaskManagementUtils:
         return data
 
     def get_all_tasks_data(self, operator=None):
-        data = dict()
-        
         if operator:
-            for task_name, task in self.task_map.items():
-                data.update({task_name:task.data[operator]})
-        else:
-            for task_name, task in self.task_map.items():
-                data.update({task_name:task.data})
-            
-        return data   
+            return {task_name: task.data[operator] for task_name, task in self.task_map.items()}
+
+        return {task_name: task.data for task_name, task in self.task_map.items()}
+
+    def iter_tasks_data(self, operator=None, release=False):
+        for task_name, task in self.task_map.items():
+            yield task_name, task.data[operator] if operator else task.data
+            if release:
+                # The consumer has moved on, so drop the task's reference to what it was given
+                for op in ([operator] if operator else list(task.data)):
+                    task.release(op)
+                task.update_status()
     
     def get_task(self, task_name):
         task = self.task_map.get(task_name)
@@ -725,11 +1140,16 @@ class Pipe(TaskManagementUtils):
     :param tasks: A list of tasks as dictionaries, with task information.
     :param tasks_file_path: A file path to a file containing the tasks.
     :param tasks_kwargs: A dictionary of variables to be replaced within the tasks.
-    :param wrangler: An object that represents the wrangler operation.
-    :param loader: An object that represents the loader operation.
+    :param wrangler: An object that represents the wrangler operation. One instance serves every task of the pipe,
+    including tasks run concurrently by run_all, run_async, run(num_lines>1) and Pipeline.run_scheduled, so it must
+    not keep per-call state on itself.
+    :param loader: An object that represents the loader operation. Shared across tasks like the wrangler.
     :param credential_manager: An object that manages the credentials.
     :param secret_id: An id to access a secret.
     :param name: The name of the pipeline.
+    :param thread_safe_client: (Optional) False to give each thread running tasks its own api client. Default is True.
+    :param max_workers: (Optional) Default number of threads used by run_all.
+    :param cache_dir: (Optional) Directory where tasks created with `cache` keep the data of completed runs.
 
     :attribute:
     - _status: A pipe status indicating if the pipeline is IDLE, INCOMPLETE, COMPLETE, or FAIL.
@@ -749,19 +1169,37 @@ class Pipe(TaskManagementUtils):
     - initialize_wrangler(): Initializes the wrangler, if it exists.
     - initialize_loader(): Initializes the loader, if it exists.
     - initialize(credentials_obj): Initializes the pipeline, including the handle, wrangler, and loader.
-    - run(): Runs every task in the pipe and then updates _status
+    - ainitialize(credentials_obj): Coroutine initializing the handle, wrangler, and loader concurrently in threads.
+    - run(num_lines=1, resume=False): Runs every task in the pipe, spread round-robin over `num_lines` threads, and then updates _status.
+    With `resume`, each task only reruns the operations that did not complete.
+    - run_all(max_workers=None): Runs every task in the pipe concurrently and then updates _status
+    - run_async(): Coroutine running every task in the pipe concurrently, then updating _status
+    - run_batch(): Like run(), but handles every single-request task through one `get_data_batch` call when the client has one
+    - run_staged(prefetch=2): Runs the handle, wrangle and load of consecutive tasks in overlapping stages, then updates _status
 
     Inherits all methods from the parent class, TaskManagementUtils.
     """
+    __slots__ = ('_status', 'name', 'secret_id', 'handle', 'wrangler', 'loader', 'max_workers', 'cache_dir',
+                 '_initializers', '_pipe_failed', '_repr_cache', '_serial_lock')
+
     def __init__(self, api_handle, tasks=None, tasks_file_path=None, tasks_kwargs=None, 
-                 wrangler=None, loader=None, secret_id=None, name=None):
+                 wrangler=None, loader=None, secret_id=None, name=None, thread_safe_client=True, max_workers=None,
+                 cache_dir=None):
         super().__init__()
         self._status: PipeStatus = PipeStatus.IDLE
         self.name = name
+        self.cache_dir = cache_dir
         self.secret_id = secret_id
-        self.handle = Handle(api_handle)
+        self.max_workers = max_workers
+        self.handle = Handle(api_handle, thread_safe_client=thread_safe_client)
         self.wrangler = Wrangler(wrangler) if wrangler else None
         self.loader = Loader(loader) if loader else None
+        # Only the operators this pipe actually has, so initialize doesn't re-check them each call
+        self._initializers = []
+        if self.wrangler:
+            self._initializers.append(self.initialize_wrangler)
+        if self.loader:
+            self._initializers.append(self.initialize_loader)
         tasks = tasks if tasks is not None else self.read_tasks(
             tasks_file_path, tasks_kwargs, dynamic_reader=self.dynamically_read)
         
@@ -771,51 +1209,70 @@ class Pipe(TaskManagementUtils):
             ) for task_data in tasks]
         
         self.task_map = {task.name: task for task in task_objs}
+        for task in self.task_map.values():
+            self._track_task(task)
         self._pipe_failed = False    
-
-    def __getattribute__(self, name):
-        try:
-            return object.__getattribute__(self, name)
-        except AttributeError:
-            if name in self.task_map:
-                return self.task_map[name]
-            else:
-                raise AttributeError(f"Pipe object has no attribute '{name}'")
+        self._repr_cache = None
+        # Held by a SERIAL task for as long as it runs, whichever of the pipe's run methods is running it
+        self._serial_lock = threading.Lock()
+
+    def _track_task(self, task):
+        super()._track_task(task)
+        task.cache_dir = self.cache_dir
+        task.cache_scope = (self.name, self.secret_id)
+
+    def _run_task(self, task, resume=False):
+        if task.pipe_type == 'SERIAL':
+            with self._serial_lock:
+                return task.run(resume)
+        return task.run(resume)
+
+    def __getattr__(self, name):
+        # Only reached once normal attribute lookup has failed. An unset task_map slot lands
+        # here too, so it must not be looked up again.
+        if name != 'task_map' and name in self.task_map:
+            return self.task_map[name]
+        raise AttributeError(f"Pipe object has no attribute '{name}'")
 
     def __getitem__(self, name):
-        try:
-            return self.task_map[name]
-        except KeyError:
+        task = self.task_map.get(name)
+        if task is None:
             raise KeyError(f"'{name}' not in Pipe")
+        return task
             
     def __repr__(self):
-        task_strs = [task.__repr__() for task in self.task_map.values()]
-        task_str = '\n'.join(task_strs)
-        indented_task_str = textwrap.indent(task_str, '  ')
-        return (
-            f"Pipe('{self.name}', status='{self._status.value}',\n"
-                    f"{indented_task_str.rstrip(',')})")
+        # Only rebuilt once a task or the pipe itself has changed since the last call
+        cache_key = (self._task_version, self._status, self.name)
+        if self._repr_cache is None or self._repr_cache[0] != cache_key:
+            task_str = '\n'.join(['  ' + task.__repr__() for task in self.task_map.values()])
+            pipe_str = (
+                f"Pipe('{self.name}', status='{self._status.value}',\n"
+                        f"{task_str.rstrip(',')})")
+            self._repr_cache = (cache_key, pipe_str)
+
+        return self._repr_cache[1]
     
     @property
     def status(self) -> PipeStatus:
         return self._status 
     
     def update_status(self):
-        status_counts = self.get_task_status_counts()
+        status_counts = self._status_counts
+        n_tasks = len(self.task_map)
         
-        if status_counts[TaskStatus.PENDING.value] == len(self.task_map):
+        if status_counts[TaskStatus.PENDING.value] == n_tasks:
             pass
-        elif status_counts[TaskStatus.COMPLETE.value] == len(self.task_map):
+        elif status_counts[TaskStatus.COMPLETE.value] == n_tasks:
             self._status = PipeStatus.COMPLETE
         else:
             self._status = PipeStatus.INCOMPLETE
 
         return self.status
     
-    def initialize_handle(self, credentials_obj):
-        status = self.handle.initialize(credentials_obj)
-        self.operator_statuses.update(handle=status)
-        if status == OpStatus.FAIL:
+    def initialize_handle(self, credentials_obj, client_cache=None):
+        status = self.handle.initialize(credentials_obj, client_cache)
+        self.operator_statuses['handle'] = status
+        if status is OpStatus.FAIL:
             self._status = PipeStatus.FAIL
             
         return status
@@ -823,32 +1280,144 @@ class Pipe(TaskManagementUtils):
     def initialize_wrangler(self):
         if self.wrangler:
             status = self.wrangler.initialize()
-            self.operator_statuses.update(wrangler=status)
+            self.operator_statuses['wrangler'] = status
 
             return status
     
     def initialize_loader(self):
         if self.loader:
             status = self.loader.initialize()
-            self.operator_statuses.update(wrangler=status)
+            self.operator_statuses['loader'] = status
 
             return status
         
-    def initialize(self, credentials_obj):
-        handle_status = self.initialize_handle(credentials_obj)
-        self.initialize_wrangler()
-        self.initialize_loader()
-        if self._status == PipeStatus.IDLE and handle_status == OpStatus.INITIALIZED:
+    def initialize(self, credentials_obj, client_cache=None):
+        handle_status = self.initialize_handle(credentials_obj, client_cache)
+        for initializer in self._initializers:
+            initializer()
+        if self._status is PipeStatus.IDLE and handle_status is OpStatus.INITIALIZED:
             self._status = PipeStatus.READY
         
         return self.operator_statuses
+
+    async def ainitialize_handle(self, credentials_obj, client_cache=None):
+        return await asyncio.to_thread(self.initialize_handle, credentials_obj, client_cache)
+
+    async def ainitialize(self, credentials_obj, client_cache=None):
+        # The wrangler and loader don't depend on the handle, so all three initialize concurrently
+        handle_status, *_ = await asyncio.gather(
+            self.ainitialize_handle(credentials_obj, client_cache),
+            *(asyncio.to_thread(initializer) for initializer in self._initializers))
+        if self._status is PipeStatus.IDLE and handle_status is OpStatus.INITIALIZED:
+            self._status = PipeStatus.READY
+
+        return self.operator_statuses
         
-    def run(self):
-        for task_name, task in self.task_map.items():
-            new_status = task.run()
+    def run(self, num_lines=1, resume=False):
+        tasks = list(self.task_map.values())
+        if num_lines > 1 and len(tasks) > 1:
+            # Each line runs its share of the tasks in order
+            def run_line(line):
+                for task in line:
+                    self._run_task(task, resume)
+
+            lines = [tasks[start::num_lines] for start in range(min(num_lines, len(tasks)))]
+            with ThreadPoolExecutor(max_workers=len(lines)) as executor:
+                for future in [executor.submit(run_line, line) for line in lines]:
+                    future.result()
+        else:
+            for task in tasks:
+                self._run_task(task, resume)
         
-        pipe_status = self.update_status()
-        return pipe_status
+        # The status counts are already current, so this is constant time
+        return self.update_status()
+
+    async def run_async(self):
+        # The operators block on I/O, so each task runs in a worker thread
+        await asyncio.gather(*(asyncio.to_thread(self._run_task, task) for task in self.task_map.values()))
+        return self.update_status()
+
+    def run_batch(self):
+        if not self.handle.supports_batch:
+            return self.run()
+
+        # Handle operations are passed per request, so only tasks without them can share a batch.
+        # A batch sends its requests together, so SERIAL tasks are run on their own.
+        batched = []
+        for task in self.task_map.values():
+            if (isinstance(task, SingleRequestTask) and not task.special_operations['handle_ops']
+                    and task.pipe_type != 'SERIAL'):
+                batched.append(task)
+            else:
+                self._run_task(task)
+
+        if batched:
+            responses, error = self.handle.run_batch([task.request for task in batched])
+            if error is not None:
+                responses = [None] * len(batched)
+            for task, response in zip(batched, responses):
+                task.run_from_response(response, error)
+
+        return self.update_status()
+
+    def run_all(self, max_workers=None):
+        results = super().run_all(max_workers or self.max_workers)
+        self.update_status()
+        return results
+
+    def run_staged(self, prefetch=2):
+        tasks = list(self.task_map.values())
+        if len(tasks) < 2:
+            return self.run()
+
+        # One thread per operation (handle, wrangle, load), so task t+1 is handled while task t
+        # is wrangled. Bounded queues keep at most `prefetch` tasks waiting on each stage.
+        # A SERIAL task takes the serial lock as it enters the first stage and releases it once
+        # it leaves the last, so no other SERIAL task overlaps any of its stages.
+        n_stages = max(len(task._op_plan) for task in tasks)
+        queues = [queue.Queue(maxsize=prefetch) for _ in range(n_stages)]
+        errors = []
+
+        def stage(index):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < n_stages else None
+            while True:
+                task = inbox.get()
+                if task is None:
+                    break
+
+                # Once a stage has raised, tasks are only passed along so every thread can finish
+                if not errors and index < len(task._op_plan):
+                    try:
+                        task.run_step(index)
+                    except Exception as e:
+                        errors.append(e)
+
+                if outbox is not None:
+                    outbox.put(task)
+                else:
+                    task.update_status()
+                    if task.pipe_type == 'SERIAL':
+                        self._serial_lock.release()
+
+            if outbox is not None:
+                outbox.put(None)
+
+        threads = [threading.Thread(target=stage, args=(index,)) for index in range(n_stages)]
+        for thread in threads:
+            thread.start()
+        for task in tasks:
+            if task.pipe_type == 'SERIAL':
+                self._serial_lock.acquire()
+            queues[0].put(task)
+        queues[0].put(None)
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        return self.update_status()
     
     
 class Pipeline(Pipe):
@@ -857,95 +1426,272 @@ class Pipeline(Pipe):
 
     :param pipes: A list of dictionaries representing pipes in the pipeline.
     :param pipeline_id: (Optional) An identifier for the pipeline.
+    :param max_workers: (Optional) The number of threads used when pipes are initialized or run in parallel.
+    :param credential_ttl: (Optional) Seconds a credential fetched for a secret_id is reused. Default is 300.
+    :param share_clients: (Optional) If True, pipes with the same secret_id and api_client share one
+    thread-safe client while their credential is reused. Default is False.
 
     :method:
     - `initialize_pipe(pipe_name)`: Initializes a single pipe in the pipeline.
-    - `initialize_pipes(pipe_names)`: Initializes multiple pipes in the pipeline.
-    - `initialize()`: Initializes all pipes in the pipeline.
+    - `initialize_pipes(pipe_names, parallel=False)`: Initializes multiple pipes in the pipeline.
+    - `initialize(parallel=False)`: Initializes all pipes in the pipeline.
+    - `ainitialize()`: Coroutine initializing all pipes, and each pipe's operators, concurrently on one event loop.
+    - `invalidate_credentials(secret_id=None)`: Drops cached credentials, and any shared clients built from them, for one secret_id, or all of them.
+    - `run(parallel=False)`: Runs all pipes in the pipeline, concurrently if `parallel`.
+    - `run_async()`: Coroutine running all pipes, and each pipe's tasks, concurrently.
     - `run_task(pipe_name, task_name)`: Executes a single task in a pipe.
     - `run_pipe(pipe_name)`: Executes all tasks in a single pipe.
     - `get_pipe(pipe_name)`: Returns a single pipe in the pipeline.
     - `get_pipe_data(pipe_name, operator=None)`: Returns data generated by a pipe.
+    - `iter_pipe_data(pipe_name, operator=None, release=False)`: Yields a pipe's data one task at a time. Preferred for large outputs when `release` is set, since each task's data is freed as the consumer moves on.
+    - `run_scheduled(max_workers=None)`: Runs every task in the pipeline on a shared pool, each as soon as its `deps` have completed.
+    - `iter_tasks()`: Yields a flat `(pipe_name, task_name, task)` tuple for every task in the pipeline.
 
     :attribute:
     - `id`: An identifier for the pipeline.
     - `credential_manager`: An object for managing credentials.
     - `pipes`: A dictionary mapping pipe names to pipes.
+    - `tasks`: A read-only mapping of pipe names to each pipe's read-only task map.
     """
-    def __init__(self, pipeline_id: str, pipes: [dict,], credential_manager: 'func'):
+    __slots__ = ('id', 'credential_manager', 'credential_ttl', '_cred_cache', '_client_caches', 'pipes', '_tasks')
+
+    def __init__(self, pipeline_id: str, pipes: [dict,], credential_manager: 'func', max_workers=None,
+                 credential_ttl=300, share_clients=False):
         #self.loader = loader
         self.id = pipeline_id
         self.credential_manager = credential_manager
+        self.credential_ttl = credential_ttl
+        self._cred_cache = {}
+        # secret_id -> {api_client: (credentials, client)}, or None when clients are not shared
+        self._client_caches = {} if share_clients else None
         self.pipes = {pipe.name:pipe for pipe in pipes}
+        self.max_workers = max_workers
+        self._tasks = None
     
     def __repr__(self):
-        pipe_strs = [pipe.__repr__() for pipe in self.pipes.values()]
-        pipe_str = '\n'.join(pipe_strs)
-        indented_pipe_str = textwrap.indent(pipe_str, '  ')
+        pipe_str = '\n'.join(['  ' + pipe.__repr__().replace('\n', '\n  ') for pipe in self.pipes.values()])
         return (
             f"Pipeline('{self.id}',\n"
-                    f"{indented_pipe_str.rstrip(',')})")
+                    f"{pipe_str.rstrip(',')})")
     
-    def __getattribute__(self, name):
-        try:
-            return object.__getattribute__(self, name)
-        except AttributeError:
-            if name in self.pipes:
-                return self.pipes[name]
-            else:
-                raise AttributeError(f"Pipeline object has no attribute '{name}'")
+    def __getattr__(self, name):
+        # Only reached once normal attribute lookup has failed. An unset pipes slot lands
+        # here too, so it must not be looked up again.
+        if name != 'pipes' and name in self.pipes:
+            return self.pipes[name]
+        raise AttributeError(f"Pipeline object has no attribute '{name}'")
 
     def __getitem__(self, name):
-        try:
-            return self.pipes[name]
-        except KeyError:
+        pipe = self.pipes.get(name)
+        if pipe is None:
             raise KeyError(f"'{name}' not in Pipeline")
+        return pipe
     
+    @property
+    def tasks(self):
+        # Built once; the inner proxies are live views of each pipe's task_map, so tasks added
+        # to a pipe show up without a rebuild
+        if self._tasks is None:
+            self._tasks = MappingProxyType({
+                pipe_name: MappingProxyType(pipe.task_map) for pipe_name, pipe in self.pipes.items()})
+        return self._tasks
+
     @staticmethod
     def _check_pipe_not_failed(pipe):
         if pipe._pipe_failed:
             raise Exception("Pipeline failed earlier, cannot run further operations")
+
+    def _check_pipes_not_failed(self):
+        for pipe in self.pipes.values():
+            self._check_pipe_not_failed(pipe)
             
     def pipes_generator(self):
         for pipe_name, pipe in self.pipes.items():
             yield pipe
     
     def tasks_generator(self):
+        for pipe_name, pipe in self.pipes.items():
+            yield from pipe.task_map.values()
+
+    def iter_tasks(self):
         for pipe_name, pipe in self.pipes.items():
             for task_name, task in pipe.task_map.items():
-                yield task
+                yield pipe_name, task_name, task
     
+    def _get_credentials(self, secret_id):
+        # Pipes commonly share a secret_id, so reuse a fetched credential until it is credential_ttl seconds old
+        now = time.monotonic()
+        cached = self._cred_cache.get(secret_id)
+        if cached is not None and now - cached[0] < self.credential_ttl:
+            return cached[1]
+
+        credential_obj = self.credential_manager(secret_id)
+        self._cred_cache[secret_id] = (now, credential_obj)
+        return credential_obj
+
+    def invalidate_credentials(self, secret_id=None):
+        if secret_id is None:
+            self._cred_cache.clear()
+            if self._client_caches is not None:
+                self._client_caches.clear()
+        else:
+            self._cred_cache.pop(secret_id, None)
+            if self._client_caches is not None:
+                self._client_caches.pop(secret_id, None)
+
+    def _client_cache(self, secret_id):
+        if self._client_caches is None:
+            return None
+        return self._client_caches.setdefault(secret_id, {})
+
     def initialize_pipe(self, pipe_name):
         pipe = self.pipes[pipe_name]    
-        credential_obj = self.credential_manager(pipe.secret_id)
-        status = pipe.initialize(credential_obj)
+        credential_obj = self._get_credentials(pipe.secret_id)
+        status = pipe.initialize(credential_obj, self._client_cache(pipe.secret_id))
             
         return status  
         
-    def initialize_pipes(self, pipe_names):
-        results = dict()
+    def initialize_pipes(self, pipe_names, parallel=False):
+        if parallel:
+            # Pipes are independent, and initializing one is mostly credential and connection I/O
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {pipe_name: executor.submit(self.initialize_pipe, pipe_name) for pipe_name in pipe_names}
+                return {pipe_name: future.result() for pipe_name, future in futures.items()}
+
+        results = {}
         for pipe_name in pipe_names:
-            results.update({pipe_name:self.initialize_pipe(pipe_name)})
+            results[pipe_name] = self.initialize_pipe(pipe_name)
             
         return results
             
-    def initialize(self):
-        results = self.initialize_pipes(self.pipes.keys()) 
+    def initialize(self, parallel=False):
+        results = self.initialize_pipes(self.pipes.keys(), parallel) 
         return results  
+
+    async def ainitialize_pipe(self, pipe_name):
+        pipe = self.pipes[pipe_name]
+        credential_obj = await asyncio.to_thread(self._get_credentials, pipe.secret_id)
+        return await pipe.ainitialize(credential_obj, self._client_cache(pipe.secret_id))
+
+    async def ainitialize(self):
+        pipe_names = list(self.pipes)
+        statuses = await asyncio.gather(*(self.ainitialize_pipe(pipe_name) for pipe_name in pipe_names))
+        return dict(zip(pipe_names, statuses))
     
-    def run(self):
-        results = dict()
+    def run(self, parallel=False):
+        # Checked once up front rather than per pipe inside the run loop
+        self._check_pipes_not_failed()
+
+        if parallel:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {pipe_name: executor.submit(pipe.run) for pipe_name, pipe in self.pipes.items()}
+                return {pipe_name: future.result() for pipe_name, future in futures.items()}
+
+        results = {}
         for pipe_name, pipe in self.pipes.items():
-            self._check_pipe_not_failed(pipe)
-            result = pipe.run()
-            results.update({pipe_name:result})
+            results[pipe_name] = pipe.run()
         
         return results
+
+    def _task_graph(self):
+        successors = {}
+        in_degree = {}
+        for pipe_name, task_name, task in self.iter_tasks():
+            key = (pipe_name, task_name)
+            successors.setdefault(key, [])
+            in_degree[key] = len(task.deps)
+            for dep in task.deps:
+                if dep not in self.pipes[pipe_name].task_map:
+                    raise ValueError(f"Task {task_name} depends on unknown task {dep} in pipe {pipe_name}")
+                successors.setdefault((pipe_name, dep), []).append(key)
+
+        # Kahn's algorithm over a copy, so cycles are reported before anything runs
+        remaining = dict(in_degree)
+        ready = [key for key, degree in remaining.items() if not degree]
+        visited = 0
+        while ready:
+            visited += 1
+            for successor in successors[ready.pop()]:
+                remaining[successor] -= 1
+                if not remaining[successor]:
+                    ready.append(successor)
+        if visited != len(in_degree):
+            raise ValueError("Task dependencies contain a cycle")
+
+        return successors, in_degree
+
+    def run_scheduled(self, max_workers=None):
+        """
+        Runs every task in the pipeline on one pool of workers. Tasks are submitted as soon
+        as their dependencies have completed, so a pipe with slow tasks does not hold back
+        the others. Tasks depending on one that did not complete are not run.
+
+        :param max_workers: (Optional) Number of worker threads. Defaults to self.max_workers.
+        :return: {pipe_name: {task_name: op statuses, or None if the task was not run}}
+        :raises: ValueError if a dependency is unknown or the dependencies contain a cycle
+        """
+        self._check_pipes_not_failed()
+
+        successors, in_degree = self._task_graph()
+        results = {pipe_name: dict.fromkeys(pipe.task_map) for pipe_name, pipe in self.pipes.items()}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            def submit(key):
+                pipe = self.pipes[key[0]]
+                return executor.submit(pipe._run_task, pipe.task_map[key[1]])
+
+            running = {submit(key): key for key, degree in in_degree.items() if not degree}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    results[key[0]][key[1]] = future.result()
+                    if self.pipes[key[0]].task_map[key[1]]._status is not TaskStatus.COMPLETE:
+                        continue
+                    for successor in successors[key]:
+                        in_degree[successor] -= 1
+                        if not in_degree[successor]:
+                            running[submit(successor)] = successor
+
+        self._update_statuses()
+        return results
+
+    async def run_async(self):
+        self._check_pipes_not_failed()
+
+        pipe_names = list(self.pipes)
+        statuses = await asyncio.gather(*(self.pipes[pipe_name].run_async() for pipe_name in pipe_names))
+        return dict(zip(pipe_names, statuses))
+
+    def run_task(self, pipe_name, task_name):
+        pipe = self.pipes[pipe_name]
+        self._check_pipe_not_failed(pipe)
+        return pipe.run_task(task_name)
+
+    def run_pipe(self, pipe_name):
+        pipe = self.pipes[pipe_name]
+        self._check_pipe_not_failed(pipe)
+        return pipe.run()
     
+    def get_pipe(self, pipe_name):
+        pipe = self.pipes.get(pipe_name)
+        if pipe is None:
+            raise ValueError(f"Pipe {pipe_name} not found")
+            
+        return pipe
+
+    def get_pipe_data(self, pipe_name, operator=None):
+        return self.pipes[pipe_name].get_all_tasks_data(operator)
+
+    def iter_pipe_data(self, pipe_name, operator=None, release=False):
+        return self.pipes[pipe_name].iter_tasks_data(operator, release)
+
     def get_statuses(self):
         statuses = {}
         for pipe_name, pipe in self.pipes.items():
-            statuses.update({pipe_name:pipe.update_status()})
+            statuses[pipe_name] = pipe.update_status()
+
+        return statuses
     
     def _update_statuses(self):
         for pipe_name, pipe in self.pipes.items():
@@ -1,19 +1,27 @@
 import pandas as pd
 
 class PandasWrangler:
+    operator_mapping = {
+        '==': 'eq',
+        '!=': 'ne',
+        '<': 'lt',
+        '>': 'gt',
+        '<=': 'le',
+        '>=': 'ge'
+    }
+
     def __init__(self):
-        self.vars = {}
-        self.operator_mapping = {
-            '==': 'eq',
-            '!=': 'ne',
-            '<': 'lt',
-            '>': 'gt',
-            '<=': 'le',
-            '>=': 'ge'
+        # Method names with their own handler; anything else is a stored variable or a DataFrame method
+        self._dispatch = {
+            '_operator': self._handle_operator,
+            '_variables': self._handle_variables,
+            'loc': self._handle_loc
         }
 
     def wrangle(self, data, *methods):
-        self.__init__()   
+        # Variables are scoped to a single wrangle call, and kept off the instance since a pipe's
+        # tasks may wrangle concurrently through it
+        variables = {}
         methods = [*methods]
         
         # Wranglers will soon be updated to only accept the handle_response and wrangle_ops
@@ -23,37 +31,34 @@ class PandasWrangler:
             method_name = list(method.keys())[0]
             method_params = method[method_name]
             try:
-                df = self._hook(df, method_name, method_params)
+                df = self._hook(df, method_name, method_params, variables)
             except Exception as e:
                 raise Exception('{'+method_name+': '+str(method_params)+'}'+f'\n  Produced Error:\n{e}') from e
 
         return df
 
-    def _hook(self, df, method_name, method_params):
-        if method_name == '_operator':
-            return self._handle_operator(df, method_params)
-        elif method_name == "_variables":
-            return self._handle_variables(df, method_params)
-        elif method_name == 'loc':
-            return self._handle_loc(df, method_params)
+    def _hook(self, df, method_name, method_params, variables):
+        handler = self._dispatch.get(method_name)
+        if handler is not None:
+            return handler(df, method_params, variables)
         elif method_name.startswith("__"):
-            return self._handle_stored_variable(df, method_name, method_params)
+            return self._handle_stored_variable(df, method_name, variables)
         else:
             return self._handle_regular_method(df, method_name, method_params)
 
-    def _handle_operator(self, df, method_params):
+    def _handle_operator(self, df, method_params, variables):
         column, operator, value = method_params
         method_name = self.operator_mapping.get(operator)
         method_params = [value]
         df = df.loc[self._handle_regular_method(df[column], method_name, method_params)]
         return df
 
-    def _handle_variables(self, df, method_params):
+    def _handle_variables(self, df, method_params, variables):
         for var_name, var_params in method_params.items():
-            self.vars[var_name] = var_params
+            variables[var_name] = var_params
         return df
 
-    def _handle_loc(self, df, method_params):
+    def _handle_loc(self, df, method_params, variables):
         if type(method_params) is dict:
             index = method_params.get('index', [])
             columns = method_params.get('columns', [])
@@ -67,11 +72,11 @@ class PandasWrangler:
             df = df.loc[method_params]
         return df
 
-    def _handle_stored_variable(self, df, method_name, method_params):
+    def _handle_stored_variable(self, df, method_name, variables):
         var_name = method_name[2:]
-        if var_name not in self.vars:
+        if var_name not in variables:
             raise KeyError(f"No stored variables with name '{var_name}'")
-        method_params = self.vars[var_name]
+        method_params = variables[var_name]
 
         method = getattr(df, method_params["method_name"])
         if method is None:
@@ -81,9 +86,7 @@ class PandasWrangler:
 
         method_params_type = type(method_params["method_params"])
         if method_params_type is dict:
-            args = method_params["method_params"].pop('args', [])
-            kwargs = method_params["method_params"].pop('kwargs', {})
-            df = method(*args, **kwargs, **method_params["method_params"])
+            df = self._call_with_params(method, method_params["method_params"])
         elif method_params_type is list:
             df = method(*method_params["method_params"])
         else:
@@ -100,12 +103,24 @@ class PandasWrangler:
 
         method_params_type = type(method_params)
         if method_params_type is dict:
-            args = method_params.pop('args', [])
-            kwargs = method_params.pop('kwargs', {})
-            df = method(*args, **kwargs, **method_params)
+            df = self._call_with_params(method, method_params)
         elif method_params_type is list:
             df = method(*method_params)
         else:
             raise TypeError(f"Method parameters must be a list or a dict, not '{method_params_type}'")     
 
-        return df
\ No newline at end of file
+        return df
+
+    @staticmethod
+    def _call_with_params(method, method_params):
+        # Reads 'args' and 'kwargs' without popping them, so the task's operations survive reruns.
+        # Keyword arguments are merged into one dict, rather than unpacking kwargs and the rest separately.
+        call_kwargs = {key: val for key, val in method_params.items() if key != 'args' and key != 'kwargs'}
+        kwargs = method_params.get('kwargs')
+        if kwargs:
+            duplicates = call_kwargs.keys() & kwargs.keys()
+            if duplicates:
+                raise TypeError(f"Got multiple values for keyword arguments {sorted(duplicates)}")
+            call_kwargs.update(kwargs)
+
+        return method(*method_params.get('args', ()), **call_kwargs)
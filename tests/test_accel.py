@@ -0,0 +1,24 @@
+import unittest
+
+from pypee.accel import jit
+
+
+class TestJit(unittest.TestCase):
+
+    def test_bare_decorator(self):
+        @jit
+        def double(x):
+            return x * 2
+
+        self.assertEqual(double(2), 4)
+
+    def test_called_decorator(self):
+        @jit()
+        def double(x):
+            return x * 2
+
+        self.assertEqual(double(2), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,582 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from pypee.line import (
+    _DYN_PATTERN, _find_vars, _substitute, ErrorInfo, MultiRequestTask, OpStatus, Pipe, PipeStatus, Pipeline,
+    TaskStatus)
+
+
+class Client:
+    """Api client echoing each request, recording every request it receives."""
+
+    def __init__(self, credentials):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get_data(self, request, *handle_ops):
+        with self.lock:
+            self.requests.append(request['q'])
+        return request
+
+
+class Wrangler:
+    """Wrangler tagging the handle response with its ops, failing while `fail` is set."""
+
+    fail = False
+
+    def wrangle(self, task, *wrangle_ops):
+        if Wrangler.fail:
+            raise RuntimeError('wrangle failed')
+        return (task.data['handle']['q'], wrangle_ops)
+
+
+def make_pipe(tasks, name='p', **kwargs):
+    pipe = Pipe(Client, tasks=tasks, name=name, **kwargs)
+    pipe.initialize(None)
+    return pipe
+
+
+def caught_error():
+    try:
+        raise ValueError('bad value')
+    except ValueError as e:
+        return ErrorInfo(e)
+
+
+class TestErrorInfo(unittest.TestCase):
+
+    def test_mapping_access_includes_trace(self):
+        for read in (lambda err: 'trace' in err, lambda err: 'trace' in list(err),
+                     lambda err: 'trace' in dict(err), lambda err: 'trace' in json.loads(json.dumps(err))):
+            self.assertTrue(read(caught_error()))
+
+    def test_equality_does_not_depend_on_earlier_reads(self):
+        fields = {'type': 'ValueError', 'message': 'bad value'}
+        unread, read = caught_error(), caught_error()
+        read['trace']
+
+        self.assertNotEqual(unread, fields)
+        self.assertNotEqual(read, fields)
+        self.assertEqual(unread, dict(read))
+
+    def test_frames_cleared_once_formatted(self):
+        def fail():
+            big = [0] * 10
+            raise ValueError(len(big))
+
+        try:
+            fail()
+        except ValueError as e:
+            err = ErrorInfo(e)
+        err['trace']
+        self.assertEqual(err.exc.__traceback__.tb_next.tb_frame.f_locals, {})
+
+
+class RowsClient(Client):
+    """Client answering 'ids' requests with rows of ids, and echoing anything else."""
+
+    def get_data(self, request, *handle_ops):
+        super().get_data(request, *handle_ops)
+        if request['q'] == 'ids':
+            return [{'id': 1}, {'id': 2}, {'id': 1}]
+        return request
+
+
+class TestSubstitute(unittest.TestCase):
+
+    def test_substitutes_keys_and_nested_values(self):
+        values = {'col': 'name', 'n': 5}
+        result = _substitute(
+            {'{{col}}_sort': ['{{col}}', {'limit': 'top {{n}}'}], 'plain': 1},
+            _DYN_PATTERN, lambda match: values[match.group(1)])
+
+        self.assertEqual(result, {'name_sort': ['name', {'limit': 'top 5'}], 'plain': 1})
+
+    def test_whole_value_keeps_type_but_keys_stay_strings(self):
+        result = _substitute({'{{n}}': '{{n}}'}, _DYN_PATTERN, lambda match: 5)
+        self.assertEqual(result, {'5': 5})
+
+
+class TestFindVars(unittest.TestCase):
+
+    def test_finds_names_in_keys_and_values(self):
+        found = _find_vars({'<<key>>': ['a <<é>>', {'x': '<<say "hi">>'}], 1: 'none'},
+                           MultiRequestTask._VAR_PATTERN)
+        self.assertEqual(found, {'key', 'é', 'say "hi"'})
+
+
+class TestMultiRequestTask(unittest.TestCase):
+
+    def test_template_vars_per_request(self):
+        pipe = make_pipe([{'name': 'm', 'requests': {'ids': {'q': 'ids'}, 'details': {'q': '<<id>>'}}}])
+        self.assertEqual(pipe.m.template_vars, {'ids': set(), 'details': {'id'}})
+
+    def test_later_request_filled_from_earlier_response(self):
+        pipe = Pipe(RowsClient, name='p', tasks=[{'name': 'm', 'requests': {
+            'ids': {'q': 'ids'},
+            'details': {'q': 'details', 'filter': 'id in (<<id>>)', '<<id>>': 'keyed'},
+        }}])
+        pipe.initialize(None)
+        pipe.run()
+
+        self.assertEqual(pipe.m.data['handle'][1],
+                         {'q': 'details', 'filter': 'id in (1, 2)', '1, 2': 'keyed'})
+
+    def test_separator(self):
+        pipe = Pipe(RowsClient, name='p', tasks=[{'name': 'm', 'requests': {
+            'ids': {'q': 'ids'},
+            'details': {'q': 'details', 'filter': '<<id>>', '%separator%': '|'},
+        }}])
+        pipe.initialize(None)
+        pipe.run()
+
+        self.assertEqual(pipe.m.data['handle'][1]['filter'], '1|2')
+
+
+def write_tasks(test, tasks):
+    """Writes tasks to a temporary JSON file removed when the test ends, returning its path."""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as tasks_file:
+        json.dump(tasks, tasks_file)
+    test.addCleanup(os.remove, tasks_file.name)
+    return tasks_file.name
+
+
+class TestReadTasks(unittest.TestCase):
+
+    def test_pipes_from_one_file_get_separate_tasks(self):
+        path = write_tasks(self, [{'name': 'a', 'request': {'q': 'a'}}])
+        first = Pipe(Client, tasks_file_path=path, name='first')
+        second = Pipe(Client, tasks_file_path=path, name='second')
+
+        first.a.request['q'] = 'changed'
+        self.assertEqual(second.a.request, {'q': 'a'})
+
+    def test_rereads_an_edited_file(self):
+        path = write_tasks(self, [{'name': 'a', 'request': {'q': 'a'}}])
+        Pipe(Client, tasks_file_path=path, name='p')
+        with open(path, 'w') as tasks_file:
+            json.dump([{'name': 'b', 'request': {'q': 'b'}}], tasks_file)
+
+        self.assertEqual(list(Pipe(Client, tasks_file_path=path, name='p').task_map), ['b'])
+
+    def test_duplicate_names_raise(self):
+        path = write_tasks(self, [{'name': 'a', 'request': {'q': 1}}, {'name': 'a', 'request': {'q': 2}}])
+        with self.assertRaisesRegex(ValueError, 'Duplicate'):
+            Pipe(Client, tasks_file_path=path, name='p')
+
+
+class Loader:
+    """Loader returning the wrangled data unchanged."""
+
+    def load(self, task, *load_ops):
+        return task.data['wrangle']
+
+
+class TestInitialize(unittest.TestCase):
+
+    def test_initialize_twice(self):
+        pipe = make_pipe([{'name': 'a', 'request': {'q': 'a'}}], wrangler=Wrangler, loader=Loader)
+        wrangler, loader = pipe.wrangler.wrangler, pipe.loader.loader
+        pipe.initialize(None)
+
+        self.assertIsNot(pipe.wrangler.wrangler, wrangler)
+        self.assertIsNot(pipe.loader.loader, loader)
+        pipe.run()
+        self.assertEqual(pipe.a.data['load'], ('a', ()))
+
+    def test_ainitialize(self):
+        pipe = Pipe(Client, name='p', wrangler=Wrangler, loader=Loader, tasks=[{'name': 'a', 'request': {'q': 'a'}}])
+        statuses = asyncio.run(pipe.ainitialize(None))
+
+        self.assertEqual(statuses, {'handle': OpStatus.INITIALIZED, 'wrangler': OpStatus.INITIALIZED,
+                                    'loader': OpStatus.INITIALIZED})
+        self.assertEqual(pipe.status, PipeStatus.READY)
+
+    def test_thread_unsafe_clients_are_per_thread(self):
+        clients = set()
+
+        class RecordingClient(Client):
+            def get_data(self, request, *handle_ops):
+                clients.add((threading.get_ident(), id(self)))
+                return request
+
+        pipe = Pipe(RecordingClient, name='p', thread_safe_client=False, max_workers=2,
+                    tasks=[{'name': str(i), 'request': {'q': i}} for i in range(8)])
+        pipe.initialize(None)
+        pipe.run_all()
+
+        threads = {thread for thread, client in clients}
+        self.assertEqual(len(clients), len(threads))
+
+
+class TestDynamicallyRead(unittest.TestCase):
+
+    def test_fills_in_string_variables(self):
+        path = write_tasks(self, [{'name': 'a', 'request': {'q': 'from {{start}} to {{end}}', '{{start}}': 1}}])
+        pipe = Pipe(Client, tasks_file_path=path, tasks_kwargs={'start': '2023-01-01', 'end': '2023-02-01'}, name='p')
+
+        self.assertEqual(pipe.a.request, {'q': 'from 2023-01-01 to 2023-02-01', '2023-01-01': 1})
+
+    def test_whole_value_keeps_kwarg_type(self):
+        path = write_tasks(self, [{'name': 'a', 'request': {'ids': '{{ids}}', 'limit': '{{limit}}', 'q': 'n={{limit}}'}}])
+        pipe = Pipe(Client, tasks_file_path=path, tasks_kwargs={'ids': [1, 2], 'limit': 10}, name='p')
+
+        self.assertEqual(pipe.a.request, {'ids': [1, 2], 'limit': 10, 'q': 'n=10'})
+
+    def test_missing_kwarg_raises(self):
+        path = write_tasks(self, [{'name': 'a', 'request': {'q': '{{start}} {{end}}'}}])
+        with self.assertRaisesRegex(ValueError, '"end" was dynamically entered'):
+            Pipe(Client, tasks_file_path=path, tasks_kwargs={'start': 1}, name='p')
+
+
+class TestCredentials(unittest.TestCase):
+
+    def make_pipeline(self, **kwargs):
+        self.lookups = []
+
+        def credential_manager(secret_id):
+            self.lookups.append(secret_id)
+            return {'secret': secret_id, 'version': len(self.lookups)}
+
+        pipes = [Pipe(Client, name=name, secret_id='shared', tasks=[{'name': 'a', 'request': {'q': 'a'}}])
+                 for name in ('first', 'second')]
+        return Pipeline('pl', pipes, credential_manager=credential_manager, **kwargs)
+
+    def test_reused_within_ttl(self):
+        pipeline = self.make_pipeline()
+        pipeline.initialize()
+        self.assertEqual(self.lookups, ['shared'])
+
+    def test_fetched_again_after_ttl(self):
+        pipeline = self.make_pipeline(credential_ttl=0)
+        pipeline.initialize()
+        self.assertEqual(self.lookups, ['shared', 'shared'])
+
+    def test_invalidate_credentials(self):
+        pipeline = self.make_pipeline()
+        pipeline.initialize_pipe('first')
+        pipeline.invalidate_credentials('shared')
+        pipeline.initialize_pipe('second')
+        self.assertEqual(self.lookups, ['shared', 'shared'])
+
+    def test_clients_not_shared_by_default(self):
+        pipeline = self.make_pipeline()
+        pipeline.initialize()
+        self.assertIsNot(pipeline.first.handle.client, pipeline.second.handle.client)
+
+    def test_share_clients(self):
+        pipeline = self.make_pipeline(share_clients=True)
+        pipeline.initialize()
+        self.assertIs(pipeline.first.handle.client, pipeline.second.handle.client)
+
+        asyncio.run(pipeline.ainitialize())
+        self.assertIs(pipeline.first.handle.client, pipeline.second.handle.client)
+
+    def test_invalidate_credentials_drops_shared_clients(self):
+        pipeline = self.make_pipeline(share_clients=True)
+        pipeline.initialize()
+        pipeline.invalidate_credentials('shared')
+        pipeline.initialize_pipe('first')
+
+        self.assertIsNot(pipeline.first.handle.client, pipeline.second.handle.client)
+
+
+class TestRunAll(unittest.TestCase):
+
+    def test_runs_every_task(self):
+        pipe = make_pipe([{'name': name, 'request': {'q': name}} for name in 'abcd'], max_workers=4)
+        results = pipe.run_all()
+
+        self.assertEqual(results, {name: {'handle': TaskStatus.COMPLETE} for name in 'abcd'})
+        self.assertEqual(sorted(pipe.handle.client.requests), list('abcd'))
+        self.assertEqual(pipe.status, PipeStatus.COMPLETE)
+
+
+class OverlapClient(Client):
+    """Client recording the most SERIAL requests (q starting with 's') it has handled at once."""
+
+    def __init__(self, credentials):
+        super().__init__(credentials)
+        self.active = self.peak = 0
+
+    def get_data(self, request, *handle_ops):
+        super().get_data(request, *handle_ops)
+        if not request['q'].startswith('s'):
+            return request
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return request
+
+
+class TestSerialTasks(unittest.TestCase):
+
+    def make_pipe(self):
+        pipe = Pipe(OverlapClient, name='p', max_workers=8, tasks=[
+            {'name': name, 'request': {'q': name}, 'pipe_type': 'SERIAL' if name.startswith('s') else 'PARALLEL'}
+            for name in ('s0', 'p0', 's1', 'p1', 's2', 'p2', 's3', 'p3')])
+        pipe.initialize(None)
+        return pipe
+
+    def test_run_lines_keep_order_and_serialize(self):
+        pipe = self.make_pipe()
+        pipe.run(num_lines=2)
+
+        requests = pipe.handle.client.requests
+        self.assertEqual([q for q in requests if q in ('s0', 's1', 's2', 's3')], ['s0', 's1', 's2', 's3'])
+        self.assertEqual(pipe.handle.client.peak, 1)
+        self.assertEqual(pipe.status, PipeStatus.COMPLETE)
+
+    def test_concurrent_runners_serialize(self):
+        runners = {
+            'run_all': lambda pipe: pipe.run_all(),
+            'run_async': lambda pipe: asyncio.run(pipe.run_async()),
+            'run_staged': lambda pipe: pipe.run_staged(),
+            'run_scheduled': lambda pipe: Pipeline('pl', [pipe], credential_manager=lambda secret_id: None,
+                                                   max_workers=8).run_scheduled(),
+        }
+        for name, run in runners.items():
+            with self.subTest(name):
+                pipe = self.make_pipe()
+                run(pipe)
+                self.assertEqual(pipe.handle.client.peak, 1)
+                self.assertEqual(pipe.update_status(), PipeStatus.COMPLETE)
+
+    def test_invalid_pipe_type_raises(self):
+        with self.assertRaisesRegex(ValueError, 'pipe_type'):
+            Pipe(Client, name='p', tasks=[{'name': 'a', 'request': {'q': 'a'}, 'pipe_type': 'serial'}])
+
+
+class BatchClient(Client):
+    """Client answering a whole batch of requests in one call, failing while `fail` is set."""
+
+    fail = False
+
+    def __init__(self, credentials):
+        super().__init__(credentials)
+        self.batches = []
+
+    def get_data_batch(self, requests):
+        if BatchClient.fail:
+            raise RuntimeError('batch failed')
+        self.batches.append([request['q'] for request in requests])
+        return list(requests)
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def tearDown(self):
+        BatchClient.fail = False
+
+    def make_pipe(self):
+        pipe = Pipe(BatchClient, name='p', tasks=[
+            {'name': 'a', 'request': {'q': 'a'}},
+            {'name': 'b', 'request': {'q': 'b'}},
+            {'name': 's', 'request': {'q': 's'}, 'pipe_type': 'SERIAL'},
+        ])
+        pipe.initialize(None)
+        return pipe
+
+    def test_batches_single_requests(self):
+        pipe = self.make_pipe()
+        pipe.run_batch()
+
+        self.assertEqual(pipe.handle.client.batches, [['a', 'b']])
+        self.assertEqual(pipe.handle.client.requests, ['s'])
+        self.assertEqual(pipe.a.data['handle'], {'q': 'a'})
+        self.assertEqual(pipe.status, PipeStatus.COMPLETE)
+
+    def test_caught_batch_error_fails_batched_tasks(self):
+        pipe = self.make_pipe()
+        BatchClient.fail = True
+        pipe.run_batch()
+
+        self.assertEqual(pipe.a.op_statuses['handle'], TaskStatus.FAIL)
+        self.assertEqual(pipe.a.error['message'], 'batch failed')
+        self.assertEqual(pipe.s.op_statuses['handle'], TaskStatus.COMPLETE)
+
+    def test_uncaught_batch_error_raises(self):
+        pipe = self.make_pipe()
+        pipe.handle.catch_runtime_errors = False
+        BatchClient.fail = True
+
+        with self.assertRaisesRegex(RuntimeError, 'batch failed'):
+            pipe.run_batch()
+
+
+class TestRunScheduled(unittest.TestCase):
+
+    def test_dependency_order(self):
+        order = []
+
+        class OrderedClient(Client):
+            def get_data(self, request, *handle_ops):
+                order.append(request['q'])
+                return request
+
+        pipe = Pipe(OrderedClient, name='p', tasks=[
+            {'name': 'c', 'request': {'q': 'c'}, 'deps': ['b']},
+            {'name': 'b', 'request': {'q': 'b'}, 'deps': ['a']},
+            {'name': 'a', 'request': {'q': 'a'}},
+        ])
+        pipeline = Pipeline('pl', [pipe], credential_manager=lambda secret_id: None, max_workers=4)
+        pipeline.initialize()
+        results = pipeline.run_scheduled()
+
+        self.assertEqual(order, ['a', 'b', 'c'])
+        self.assertEqual(results['p']['c'], {'handle': TaskStatus.COMPLETE})
+
+    def test_dependents_of_failed_task_not_run(self):
+        class FailingClient(Client):
+            def get_data(self, request, *handle_ops):
+                if request['q'] == 'a':
+                    raise RuntimeError('handle failed')
+                return request
+
+        pipe = Pipe(FailingClient, name='p', tasks=[
+            {'name': 'a', 'request': {'q': 'a'}},
+            {'name': 'b', 'request': {'q': 'b'}, 'deps': ['a']},
+        ])
+        pipeline = Pipeline('pl', [pipe], credential_manager=lambda secret_id: None)
+        pipeline.initialize()
+        results = pipeline.run_scheduled()
+
+        self.assertEqual(results['p']['a'], {'handle': TaskStatus.FAIL})
+        self.assertIsNone(results['p']['b'])
+
+    def test_cycle_raises(self):
+        pipe = make_pipe([
+            {'name': 'a', 'request': {'q': 'a'}, 'deps': ['b']},
+            {'name': 'b', 'request': {'q': 'b'}, 'deps': ['a']},
+        ])
+        pipeline = Pipeline('pl', [pipe], credential_manager=lambda secret_id: None)
+        with self.assertRaisesRegex(ValueError, 'cycle'):
+            pipeline.run_scheduled()
+        self.assertEqual(pipe.handle.client.requests, [])
+
+    def test_unknown_dependency_raises(self):
+        pipe = make_pipe([{'name': 'a', 'request': {'q': 'a'}, 'deps': ['missing']}])
+        pipeline = Pipeline('pl', [pipe], credential_manager=lambda secret_id: None)
+        with self.assertRaisesRegex(ValueError, 'unknown task missing'):
+            pipeline.run_scheduled()
+
+
+class TestTaskCache(unittest.TestCase):
+
+    def setUp(self):
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self._cache_dir.name
+
+    def tearDown(self):
+        self._cache_dir.cleanup()
+
+    def run_cached(self, wrangle_ops=(), secret_id=None):
+        pipe = Pipe(Client, wrangler=Wrangler, name='p', secret_id=secret_id, cache_dir=self.cache_dir, tasks=[
+            {'name': 'a', 'request': {'q': 'a'}, 'cache': True, 'wrangle_ops': list(wrangle_ops)},
+        ])
+        pipe.initialize(None)
+        pipe.run()
+        return pipe
+
+    def test_hit_skips_operators(self):
+        self.run_cached()
+        pipe = self.run_cached()
+
+        self.assertEqual(pipe.handle.client.requests, [])
+        self.assertEqual(pipe.a.data['wrangle'], ('a', ()))
+        self.assertEqual(pipe.a.op_statuses, {'handle': TaskStatus.COMPLETE, 'wrangle': TaskStatus.COMPLETE})
+
+    def test_miss_on_first_run(self):
+        pipe = self.run_cached()
+        self.assertEqual(pipe.handle.client.requests, ['a'])
+
+    def test_miss_when_wrangle_ops_change(self):
+        self.run_cached(['x'])
+        pipe = self.run_cached(['y'])
+
+        self.assertEqual(pipe.handle.client.requests, ['a'])
+        self.assertEqual(pipe.a.data['wrangle'], ('a', ('y',)))
+
+    def test_miss_for_another_secret_id(self):
+        self.run_cached(secret_id='account-1')
+        pipe = self.run_cached(secret_id='account-2')
+
+        self.assertEqual(pipe.handle.client.requests, ['a'])
+
+    def test_hit_returns_same_statuses_as_a_run(self):
+        def run():
+            pipe = make_pipe([{'name': 'm', 'requests': {'first': {'q': 'a'}, 'second': {'q': 'b'}}, 'cache': True}],
+                             cache_dir=self.cache_dir)
+            return pipe.m.run()
+
+        self.assertEqual(run(), run())
+
+
+class TestResume(unittest.TestCase):
+
+    def tearDown(self):
+        Wrangler.fail = False
+
+    def test_resume_skips_completed_operations(self):
+        pipe = make_pipe([{'name': 'a', 'request': {'q': 'a'}}], wrangler=Wrangler)
+        Wrangler.fail = True
+        pipe.run()
+        self.assertEqual(pipe.a.op_statuses['wrangle'], TaskStatus.FAIL)
+
+        Wrangler.fail = False
+        pipe.run(resume=True)
+        self.assertEqual(pipe.handle.client.requests, ['a'])
+        self.assertEqual(pipe.a.data['wrangle'], ('a', ()))
+        self.assertEqual(pipe.update_status().value, 'complete')
+
+    def test_resume_reruns_released_operations(self):
+        pipe = make_pipe([{'name': 'a', 'request': {'q': 'a'}}])
+        pipe.run()
+        list(pipe.iter_tasks_data('handle', release=True))
+
+        pipe.run(resume=True)
+        self.assertEqual(pipe.handle.client.requests, ['a', 'a'])
+        self.assertEqual(pipe.a.data['handle'], {'q': 'a'})
+
+    def test_resume_reruns_released_multi_request_task(self):
+        pipe = make_pipe([{'name': 'm', 'requests': {'first': {'q': 'a'}, 'second': {'q': 'b'}}}])
+        pipe.run()
+        list(pipe.iter_tasks_data(release=True))
+
+        pipe.run(resume=True)
+        self.assertEqual(pipe.handle.client.requests, ['a', 'b', 'a', 'b'])
+        self.assertEqual(pipe.m.data['handle'], [{'q': 'a'}, {'q': 'b'}])
+
+
+class TestRunStaged(unittest.TestCase):
+
+    def tearDown(self):
+        Wrangler.fail = False
+
+    def test_uncaught_error_propagates(self):
+        pipe = make_pipe([{'name': name, 'request': {'q': name}} for name in 'abc'], wrangler=Wrangler)
+        pipe.wrangler.catch_runtime_errors = False
+        Wrangler.fail = True
+
+        with self.assertRaisesRegex(RuntimeError, 'wrangle failed'):
+            pipe.run_staged()
+
+    def test_caught_error_marks_task_failed(self):
+        pipe = make_pipe([{'name': name, 'request': {'q': name}} for name in 'abc'], wrangler=Wrangler)
+        Wrangler.fail = True
+
+        pipe.run_staged()
+        self.assertEqual(pipe.get_task_status_counts()['incomplete'], 3)
+        self.assertEqual(pipe.a.op_statuses['wrangle'], TaskStatus.FAIL)
+
+
+if __name__ == '__main__':
+    unittest.main()
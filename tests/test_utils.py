@@ -0,0 +1,61 @@
+import unittest
+
+from pypee.utils import PandasWrangler
+
+
+class Task:
+    """Stand-in exposing the handle response where PandasWrangler reads it."""
+
+    def __init__(self, handle_response):
+        self.data = {'handle': handle_response}
+
+
+class TestPandasWrangler(unittest.TestCase):
+
+    def test_variables_are_scoped_to_each_call(self):
+        wrangler = PandasWrangler()
+        rows = [{'x': 1}, {'x': 2}, {'x': 3}]
+
+        # Another wrangle on the same instance starts between defining and using 'h', as it
+        # can when a pipe's tasks run concurrently
+        def nested(df):
+            wrangler.wrangle(Task(rows), {'head': [1]})
+            return df
+
+        df = wrangler.wrangle(
+            Task(rows),
+            {'_variables': {'h': {'method_name': 'head', 'method_params': [2]}}},
+            {'pipe': [nested]},
+            {'__h': []})
+        self.assertEqual(df['x'].tolist(), [1, 2])
+
+    def test_unknown_variable_raises(self):
+        with self.assertRaisesRegex(Exception, "No stored variables with name 'h'"):
+            PandasWrangler().wrangle(Task([{'x': 1}]), {'__h': []})
+
+
+class TestCallWithParams(unittest.TestCase):
+
+    @staticmethod
+    def method(*args, **kwargs):
+        return args, kwargs
+
+    def test_merges_args_kwargs_and_other_keys(self):
+        params = {'args': [1, 2], 'kwargs': {'b': 3}, 'a': 4}
+        result = PandasWrangler._call_with_params(self.method, params)
+
+        self.assertEqual(result, ((1, 2), {'a': 4, 'b': 3}))
+        self.assertEqual(params, {'args': [1, 2], 'kwargs': {'b': 3}, 'a': 4})
+
+    def test_duplicate_keyword_raises(self):
+        with self.assertRaisesRegex(TypeError, r"multiple values for keyword arguments \['a'\]"):
+            PandasWrangler._call_with_params(self.method, {'kwargs': {'a': 1}, 'a': 2})
+
+    def test_wrangle_with_dict_params(self):
+        df = PandasWrangler().wrangle(
+            Task([{'x': 2}, {'x': 1}]), {'sort_values': {'args': ['x'], 'kwargs': {'ascending': True}}})
+        self.assertEqual(df['x'].tolist(), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()